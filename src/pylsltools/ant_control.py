@@ -3,7 +3,7 @@
 import io
 import argparse
 import asyncio
-import subprocess
+import logging
 import sys
 import platform
 
@@ -12,6 +12,40 @@ from pylsltools.streams import ControlReceiver, MonitorSender
 
 from .nl_mappings import hostname_device_mapper
 
+logger = logging.getLogger(__name__)
+
+# Resolve the hostname once at import time: platform.node() can be
+# syscall-backed and the mapping is static.
+hostname = hostname_device_mapper.get(platform.node(), platform.node())
+monitor_name = '_monitor_' + hostname
+
+
+class AntOutputProtocol(asyncio.SubprocessProtocol):
+    """Queue complete lines from the ant server's stdout.
+
+    pipe_data_received is driven directly by the event loop, so lines
+    reach the consumer without any polling or reader coroutine.
+    """
+
+    def __init__(self, line_queue):
+        self.line_queue = line_queue
+        # Buffer for partial lines between pipe reads.
+        self.line_buf = bytearray()
+
+    def pipe_data_received(self, fd, data):
+        self.line_buf.extend(data)
+        # Decode once per chunk: split at the last complete line and
+        # keep any trailing partial line (which may end mid-character)
+        # as bytes for the next read.
+        nl = self.line_buf.rfind(b'\n')
+        if nl == -1:
+            return
+        text = self.line_buf[:nl].decode()
+        del self.line_buf[:nl + 1]
+        for line in text.split('\n'):
+            self.line_queue.put_nowait(line.rstrip())
+
+
 class AntController():
     """Remote control of Ant lslserver."""
 
@@ -20,6 +54,7 @@ class AntController():
     state = ControlStates.STOP
     #running = True
     lsl_server_task = None
+    monitor_message_queue = None
 
     def __init__(self, control_name, debug):
         self.debug = debug
@@ -27,13 +62,14 @@ class AntController():
         self.monitorSender = MonitorSender(self.make_monitor_name(),
                                            content_type='monitor',
                                            debug=self.debug)
+        # Map control states to their handlers once, rather than
+        # chaining enum comparisons per message.
+        self.dispatch = {ControlStates.START: self.start_ant,
+                         ControlStates.PAUSE: self.stop_ant,
+                         ControlStates.STOP: self.stop}
 
     def make_monitor_name(self):
-        hostname = platform.node()
-        if hostname in hostname_device_mapper:
-            hostname = hostname_device_mapper[hostname]
-
-        return '_monitor_' + hostname
+        return monitor_name
 
     def start(self):
         # Start receiver.
@@ -45,6 +81,10 @@ class AntController():
         print('End start')
 
     async def run_tasks(self):
+        self.running = True
+        # Lines from the ant lslserver subprocess, fed by
+        # AntOutputProtocol.
+        self.monitor_message_queue = asyncio.Queue()
         async with asyncio.TaskGroup() as tg:
             tg.create_task(
                 self.handle_control_messages())
@@ -53,43 +93,37 @@ class AntController():
 
     async def handle_monitor_messages(self):
         while self.running:
-            if self.debug:
-                print('monitor task')
-            line = ''
-            if self.lsl_server_task:
-                line = self.lsl_server_task.stdout.readline()
-            if self.debug:
-                print(line)
-            await asyncio.sleep(0.1)
-            self.monitorSender.send([line.rstrip()])
+            # Block here until the protocol queues a line.
+            line = await self.monitor_message_queue.get()
+            if line is None:
+                # Sentinel from stop().
+                break
+            logger.debug('%s', line)
+            self.monitorSender.send([line])
 
     async def handle_control_messages(self):
-        self.running = True
         try:
             while self.running:
                 # Loop here waiting for messages.
-                # Block on message queue.
-                if self.debug:
-                    print('blocking receive')
-                message = self.controlReceiver.get_message(0.1)
-                if self.debug:
-                    print(self.__class__, message)
+                # Block on message queue in a worker thread to keep the
+                # event loop responsive. stop() unblocks the queue with
+                # a sentinel so there is no need for a timeout.
+                logger.debug('blocking receive')
+                message = await asyncio.to_thread(
+                    self.controlReceiver.get_message, None)
+                logger.debug('%s %s', self.__class__, message)
 
                 if message and message['state'] != self.state:
                     # Update current state.
                     self.state = message['state']
-                    # When START, run ant lslserver.
-                    if self.state == self.control_states.START:
-                        self.start_ant()
-                    if self.state == self.control_states.PAUSE:
-                        self.stop_ant()
-                    # When STOP stop this thread.
-                    if message['state'] == self.control_states.STOP:
-                        self.stop()
-                await asyncio.sleep(0.1)
+                    handler = self.dispatch.get(self.state)
+                    if handler:
+                        if asyncio.iscoroutinefunction(handler):
+                            await handler()
+                        else:
+                            handler()
         finally:
-            if self.debug:
-                print('End controller messaging.')
+            logger.debug('End controller messaging.')
             self.stop()
 
 
@@ -99,26 +133,29 @@ class AntController():
         #self.messaging_task.cancel()
         self.controlReceiver.stop()
         self.stop_ant()
+        if self.monitor_message_queue:
+            # Unblock the monitor message handler so it can exit.
+            self.monitor_message_queue.put_nowait(None)
         #super().stop()
 
-    def start_ant(self):
+    async def start_ant(self):
         print('start ant')
+        loop = asyncio.get_running_loop()
         if 'win32' in sys.platform:
             lslexe = "C:\\Users\\neuro\\Desktop\\standalone-eego-edi1-lsl-outlet-v0.0.3\\standalone_eego_edi1_lsl_outlet.exe"
-            self.lsl_server_task = subprocess.Popen(
+            transport, protocol = await loop.subprocess_exec(
+                lambda: AntOutputProtocol(self.monitor_message_queue),
                 lslexe,
                 cwd="C:\\Users\\neuro\\Desktop\\standalone-eego-edi1-lsl-outlet-v0.0.3",
-                stdout=subprocess.PIPE,
-                text=True)
+                stdin=None, stderr=None)
                 #creationflags=subprocess.DETACHED_PROCESS)
-            print(f'Ant PID: {self.lsl_server_task.pid}')
         else:
-            self.lsl_server_task = subprocess.Popen(
+            transport, protocol = await loop.subprocess_exec(
+                lambda: AntOutputProtocol(self.monitor_message_queue),
                 '/home/jamie/.local/bin/counter-test.sh',
-                stdout=subprocess.PIPE,
-                bufsize=1,
-                text=True)
-            print(f'Ant PID: {self.lsl_server_task.pid}')
+                stdin=None, stderr=None)
+        self.lsl_server_task = transport
+        print(f'Ant PID: {transport.get_pid()}')
 
     def stop_ant(self):
         if self.lsl_server_task:
@@ -144,6 +181,17 @@ def main():
         help='Print extra debugging information.')
 
     args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.WARNING)
+
+    # Use uvloop for the message-handling event loop if available.
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     controller = AntController(
         args.control_name,
         debug=args.debug)
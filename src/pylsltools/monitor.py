@@ -2,21 +2,29 @@
 
 import argparse
 import asyncio
+import logging
 import os
 import queue
 import sys
-import textwrap
-from threading import Event, Thread
+import time
+from threading import Event
 
 from pylsl import ContinuousResolver
 
 from pylsltools.streams import MonitorReceiver
 from pylsltools.utils import dev_to_name
 
+logger = logging.getLogger(__name__)
+
 
 class Monitor:
     """Monitor matching streams."""
 
+    # Pre-computed log-line template. Lines are well under the old
+    # 200-character wrap width so textwrap would be a no-op anyway.
+    log_format = ('{name} \t sample count: {sample_count} \t '
+                  'new samples: {sample_diff:04} \t stream OK: {ok}')
+
     def __init__(self, pred, json=False, debug=False):
         self.pred = pred
         self.json = json
@@ -28,33 +36,40 @@ class Monitor:
         # Dictionary to keep track of all seen streams and status
         # logging.
         self.stream_log = {}
+        # Throttle log refreshes to at most 10 Hz.
+        self.last_print_time = 0.0
 
     def start(self):
-        self.thread = Thread(target=self.run)
-        self.thread.start()
-
         print('Starting message handler.')
         # Use asyncio to handle asynchronous messages in the main thread.
         with asyncio.Runner() as runner:
             # Block here until runner returns.
             runner.run(self.handle_messages())
+        print('Handle messages returned.')
 
-        # Block main thread until resolver thread returns.
-        print('Handle messages returned, waiting for resolver.')
-        self.thread.join()
-        print('after join')
-
-    def run(self):
+    async def resolve_streams(self):
+        """Coroutine to resolve and track monitor streams."""
         resolver = ContinuousResolver(pred=self.pred, forget_after=1)
 
         while not self.is_stopped():
             # FIXME: Improve this? Continuous resolver always returns a
             # new StreamInfo object so we need to continually regenerate
             # the key to check if we've seen it before.
-            streams = resolver.results()
+            # The resolver call is blocking, so keep it off the event
+            # loop.
+            streams = await asyncio.to_thread(resolver.results)
+            # Evict stopped receivers in the same pass as tracking new
+            # streams rather than re-traversing in a separate cleanup.
+            active = {}
+            for stream_key, receiver in self.active_streams.items():
+                if receiver.is_stopped():
+                    print(f'Removing: {receiver.name}')
+                else:
+                    active[stream_key] = receiver
+            self.active_streams = active
             for stream in streams:
                 stream_key = self.make_stream_key(stream)
-                if stream_key not in self.active_streams.keys():
+                if stream_key not in self.active_streams:
                     new_stream = MonitorReceiver(
                         stream.name(),
                         stream.type(),
@@ -66,48 +81,54 @@ class Monitor:
                     self.active_streams[stream_key] = new_stream
                     new_stream.start()
                     print(f'New stream added {stream.name()}.')
-            self.cleanup()
-            self.stop_event.wait(1)
+            await asyncio.sleep(1)
         print('Resolver stopped')
 
     def stop(self):
         """Stop monitor thread and all monitor stream threads."""
         if not self.is_stopped():
             self.stop_event.set()
+            # Unblock receive message queue before blocking on the
+            # stream threads.
+            self.recv_message_queue.put('')
             for stream in self.active_streams.values():
                 stream.stop()
             for stream in self.active_streams.values():
                 stream.join()
-            # Unblock receive message queue.
-            #self.recv_message_queue.put('')
 
     async def handle_messages(self):
         try:
-            # async with asyncio.TaskGroup() as tg:
-            #     tg.create_task(self.recv_from_streams())
-            await self.recv_from_streams()
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self.resolve_streams())
+                tg.create_task(self.recv_from_streams())
         finally:
-            if self.debug:
-                print('End handle messages.')
+            logger.debug('End handle messages.')
 
     async def recv_from_streams(self):
         """Coroutine to handle messages from other threads."""
         try:
             while not self.is_stopped():
-                if not self.recv_message_queue.empty():
-                    # Block here until message received.
-                    message = self.recv_message_queue.get(timeout=0.1)
+                # Block here until message received.
+                message = await asyncio.to_thread(self.recv_message_queue.get)
+                # Drain any burst of pending messages in one pass rather
+                # than one message per wake-up.
+                while True:
                     if message:
                         self.stream_log[message['source_id']] = message
-                        if self.debug:
-                            print(f'{__class__} received message: {message}')
-                        else:
-                            self.print_log()
-                await asyncio.sleep(0.1)
+                        logger.debug('%s received message: %s',
+                                     self.__class__, message)
+                    try:
+                        message = self.recv_message_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                if not self.debug:
+                    now = time.monotonic()
+                    if now - self.last_print_time > 0.1:
+                        self.print_log()
+                        self.last_print_time = now
         finally:
-            if self.debug:
-                print(self.__class__, 'End stream messaging.')
-            #self.stop()
+            logger.debug('%s End stream messaging.', self.__class__)
+            self.stop()
 
     def print_log(self):
         # if 'win32' in sys.platform:
@@ -116,40 +137,19 @@ class Monitor:
         #     # Posix
         #     os.system('clear')
 
-        for stream, state in sorted(self.stream_log.items()):
-            print(textwrap.fill(textwrap.dedent(f'''\
-            {state['name']} \t
-            sample count: {state['sample_count']} \t
-            new samples: {state['sample_diff']:04} \t
-            stream OK: {not state['stream_lost']}
-            '''), 200))
-
-            # print(textwrap.fill(textwrap.dedent(f'''\
-            # {state['hostname']}
-            # {dev_to_name(state['hostname'])}
-            # sample count: {state['sample_count']} \t
-            # new samples: {state['sample_diff']:04} \t
-            # stream OK: {not state['stream_lost']}
-            # '''), 200))
+        print('\n'.join(
+            self.log_format.format(name=state['name'],
+                                   sample_count=state['sample_count'],
+                                   sample_diff=state['sample_diff'],
+                                   ok=not state['stream_lost'])
+            for stream, state in sorted(self.stream_log.items())))
 
     def is_stopped(self):
         return self.stop_event.is_set()
 
-    def cleanup(self):
-        for stream_key in list(self.active_streams):
-            stream = self.active_streams[stream_key]
-            if stream.is_stopped():
-                print(f'Removing: {stream.name}')
-                del self.active_streams[stream_key]
-        #print(f'Total active streams: {len(self.active_streams)}')
-
     def make_stream_key(self, stream):
-        key = ':'.join([
-            stream.name(),
-            stream.source_id(),
-            stream.hostname(),
-            str(stream.channel_count())])
-        return key
+        return (f'{stream.name()}:{stream.source_id()}:'
+                f'{stream.hostname()}:{stream.channel_count()}')
 
 def main():
     """Monitor marker streams."""
@@ -171,6 +171,16 @@ def main():
 
     args = parser.parse_args()
 
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.WARNING)
+
+    # Use uvloop for the message-handling event loop if available.
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
     # Add additional predicates.
     pred = args.pred
 
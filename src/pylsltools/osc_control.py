@@ -3,8 +3,9 @@ import asyncio
 import json
 import sys
 import time
-from threading import Thread, Event
+from threading import Event
 
+from aioconsole import ainput
 from pylsl import LostError, StreamOutlet, local_clock, proc_ALL
 from pythonosc import osc_bundle_builder, osc_message_builder, udp_client
 
@@ -25,63 +26,70 @@ class OscController(ControlSender):
         self.sc_ip = sc_ip
         self.sclang_port = sclang_port
         self.stop_event = Event()
+        # Pre-encode the state messages once: they are invariant.
+        self.start_message = json.dumps(
+            {'state': self.control_states.START.name})
+        self.pause_message = json.dumps(
+            {'state': self.control_states.PAUSE.name})
 
-    def counter(self, start_time, sf, stop_event, latency):
+    async def counter(self, start_time, sf, latency):
         logical_time = start_time
         elapsed_time = 0 - latency
         delta = 1 / sf
-        while not stop_event.is_set():
+        while not self.stop_event.is_set():
             elapsed_time = logical_time - start_time
             print(elapsed_time)
-            self.outlet.push_sample([json.dumps(
-                {'seconds': logical_time}
-            )])
+            # Build the JSON inline: json.dumps costs a dict and an
+            # encoder round-trip per tick for a single numeric field.
+            self.outlet.push_sample([f'{{"seconds": {logical_time}}}'])
             logical_time = logical_time + delta
             delay = logical_time - (local_clock() + latency)
             if delay > 0:
-                time.sleep(delay)
+                await asyncio.sleep(delay)
+            elif delay < -delta:
+                # Deadline slipped by more than one tick: re-anchor
+                # logical time to now instead of bursting samples to
+                # catch up.
+                logical_time = local_clock() + latency
+
+    def send_osc(self, address):
+        """Send a timestamped OSC bundle for a single address."""
+        bundle = osc_bundle_builder.OscBundleBuilder(
+            time.time() + self.latency)
+        msg = osc_message_builder.OscMessageBuilder(address=address)
+        bundle.add_content(msg.build())
+        self.sclang.send(bundle.build())
 
     def run(self):
         info = self.make_stream_info(self.name, self.content_type,
                                      self.source_id, self.manufacturer)
 
         self.outlet = StreamOutlet(info, chunk_size=1)
-        sclang = udp_client.SimpleUDPClient(self.sc_ip, self.sclang_port)
+        self.sclang = udp_client.SimpleUDPClient(self.sc_ip, self.sclang_port)
+        with asyncio.Runner() as runner:
+            # Block here until runner returns.
+            runner.run(self.cli())
+        print(f'Ended: {self.name}.')
+
+    async def cli(self):
+        """REPL interface for sending control messages."""
+        counter_task = None
         try:
             while not self.is_stopped():
-                state = input('Enter a command: start, pause, stop.\n')
+                # Await input without blocking the counter task.
+                state = await ainput('Enter a command: start, pause, stop.\n')
                 if state == 'start':
-                    unixtime = time.time()
                     lsl_time = local_clock()
-                    self.outlet.push_sample([json.dumps(
-                        {'state': self.control_states.START.name}
-                    )], lsl_time + self.latency)
-                    bundle = osc_bundle_builder.OscBundleBuilder(
-                        unixtime + self.latency)
-                    msg = osc_message_builder.OscMessageBuilder(address=f'/lsl/record/start')
-                    bundle.add_content(msg.build())
-                    sclang.send(bundle.build())
-                    self.counter_thread = Thread(target=self.counter, args=(
-                        lsl_time, 1/5, self.stop_event, self.latency))
-                    self.counter_thread.start()
+                    self.outlet.push_sample([self.start_message],
+                                            lsl_time + self.latency)
+                    self.send_osc('/lsl/record/start')
+                    counter_task = asyncio.create_task(
+                        self.counter(lsl_time, 1/5, self.latency))
                 elif state == 'pause':
-                    unixtime = time.time()
-                    self.outlet.push_sample([json.dumps(
-                        {'state': self.control_states.PAUSE.name}
-                    )])
-                    bundle = osc_bundle_builder.OscBundleBuilder(
-                        unixtime + self.latency)
-                    msg = osc_message_builder.OscMessageBuilder(address=f'/lsl/record/pause')
-                    bundle.add_content(msg.build())
-                    sclang.send(bundle.build())
-
+                    self.outlet.push_sample([self.pause_message])
+                    self.send_osc('/lsl/record/pause')
                 elif state == 'stop':
-                    unixtime = time.time()
-                    bundle = osc_bundle_builder.OscBundleBuilder(
-                        unixtime + self.latency)
-                    msg = osc_message_builder.OscMessageBuilder(address=f'/lsl/record/stop')
-                    bundle.add_content(msg.build())
-                    sclang.send(bundle.build())
+                    self.send_osc('/lsl/record/stop')
                     self.stop_event.set()
                     self.stop()
                 else:
@@ -89,7 +97,10 @@ class OscController(ControlSender):
         except Exception as exc:
             self.stop()
             raise exc
-        print(f'Ended: {self.name}.')
+        finally:
+            if counter_task:
+                # Block here until the counter observes the stop event.
+                await counter_task
 
 
 def main():
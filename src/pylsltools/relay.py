@@ -4,6 +4,7 @@ import argparse
 import asyncio
 import multiprocessing as mp
 import platform
+import sys
 from threading import Event, Thread
 
 from pylsl import ContinuousResolver
@@ -15,20 +16,27 @@ from pylsltools.streams import ControlReceiver, RelayStream
 class Relay:
     """Relay matching streams."""
 
-    controller = None
     control_states = ControlStates
 
     def __init__(self, pred, control_name, debug=False):
-        # Event to terminate the main process.
-        self.stop_event = Event()
-
-        # Set class attributes.
         self.pred = pred
         self.control_name = control_name
+        # Event to terminate the main process.
         self.stop_event = Event()
+        self.controller = None
         self.active_streams = {}
+        # Map resolved stream UIDs to stream keys so the resolver loop
+        # only pays the StreamInfo property calls for new streams.
+        self.uid_to_key = {}
+        # Use an explicit multiprocessing context rather than relying on
+        # the interpreter-wide default: fork avoids re-importing pylsl
+        # for every relay stream on Linux, spawn elsewhere. This matches
+        # the start method mp.Process subclasses pick up, so queues and
+        # processes stay in the same context.
+        self.ctx = mp.get_context(
+            'fork' if sys.platform == 'linux' else 'spawn')
         # For receiving messages from sub-processes.
-        self.recv_message_queue = mp.SimpleQueue()
+        self.recv_message_queue = self.ctx.SimpleQueue()
         # For receiving messages from a controller thread.
         if control_name:
             self.controller = ControlReceiver(control_name,
@@ -42,38 +50,44 @@ class Relay:
         if self.controller:
             self.controller.start()
 
-        # TODO: Wrap this in a class or co-routine.
-        self.thread = Thread(target=self.run, args=[chunk_size, max_buffered,
-                                                    re_encode_timestamps,
-                                                    output, monitor,
-                                                    monitor_interval])
-        self.thread.start()
-
         # Use asyncio to handle asynchronous messages in the main thread.
+        # The resolver runs as a coroutine on the same loop, so no
+        # dedicated thread is needed.
         with asyncio.Runner() as runner:
             # Block here until runner returns.
-            runner.run(self.handle_messages())
+            runner.run(self.handle_messages(chunk_size, max_buffered,
+                                            re_encode_timestamps, output,
+                                            monitor, monitor_interval))
 
         if self.controller:
             # Block until controller returns.
             self.controller.join()
 
-        # Block until resolver thread returns.
-        self.thread.join()
-
-    def run(self, chunk_size, max_buffered, re_encode_timestamps, output,
-            monitor, monitor_interval):
-
+    async def resolve_streams(self, chunk_size, max_buffered,
+                              re_encode_timestamps, output, monitor,
+                              monitor_interval):
+        """Coroutine to resolve and relay matching streams."""
         resolver = ContinuousResolver(pred=self.pred, forget_after=1)
 
+        # Poll quickly after recent churn and back off towards five
+        # seconds while the stream set is stable.
+        idle_cycles = 0
+
         while not self.is_stopped():
-            # FIXME: Improve this? Continuous resolver always returns a
-            # new StreamInfo object so we need to continually regenerate
-            # the key to check if we've seen it before.
-            streams = resolver.results()
+            # Continuous resolver always returns new StreamInfo objects,
+            # but their UIDs are stable per outlet, so cache on UID and
+            # only build the descriptive key for unseen streams.
+            # The resolver call is blocking, so keep it off the event
+            # loop.
+            streams = await asyncio.to_thread(resolver.results)
+            new_streams = 0
             for stream in streams:
+                uid = stream.uid()
+                if uid in self.uid_to_key:
+                    continue
                 stream_key = self.make_stream_key(stream)
-                if stream_key not in self.active_streams.keys():
+                self.uid_to_key[uid] = stream_key
+                if stream_key not in self.active_streams:
                     new_stream = RelayStream(
                         stream.name(),
                         stream.type(),
@@ -89,40 +103,86 @@ class Relay:
                         chunk_size=chunk_size,
                         max_buffered=max_buffered,
                         # Each sub-process has a unique recv_message queue.
-                        recv_message_queue=mp.SimpleQueue(),
+                        recv_message_queue=self.ctx.SimpleQueue(),
                         # Each sub-process shares the same queue for sending
                         # message to the main process.
                         send_message_queue=self.recv_message_queue,
                         debug=self.debug)
                     self.active_streams[stream_key] = new_stream
                     new_stream.start()
+                    new_streams += 1
                     print(f'New stream added: {stream.name()}.')
-            self.remove_lost_streams()
-            self.stop_event.wait(1)
-
-    async def handle_messages(self):
+            removed_streams = self.remove_lost_streams()
+            if new_streams or removed_streams:
+                idle_cycles = 0
+            else:
+                idle_cycles += 1
+            # Wait on the stop event in a worker thread so shutdown
+            # still wakes the coroutine before the backoff expires.
+            # Clamp the exponent: it only needs to reach the 5 s
+            # ceiling, and an unbounded 2 ** idle_cycles eventually
+            # overflows the float conversion.
+            await asyncio.to_thread(self.stop_event.wait,
+                                    min(5.0, 0.1 * 2 ** min(idle_cycles, 6)))
+
+    async def handle_messages(self, chunk_size, max_buffered,
+                              re_encode_timestamps, output, monitor,
+                              monitor_interval):
+        # Bridge the blocking sub-process queue onto the event loop
+        # with one long-lived reader thread, rather than paying an
+        # executor dispatch per message.
+        loop = asyncio.get_running_loop()
+        self.stream_message_queue = asyncio.Queue()
+        pump_thread = Thread(
+            target=self.pump_messages,
+            args=[self.recv_message_queue, self.stream_message_queue, loop],
+            daemon=True)
+        pump_thread.start()
         try:
             async with asyncio.TaskGroup() as tg:
+                tg.create_task(self.resolve_streams(
+                    chunk_size, max_buffered, re_encode_timestamps, output,
+                    monitor, monitor_interval))
                 tg.create_task(self.recv_from_streams())
                 if self.controller:
                     tg.create_task(self.recv_from_controller())
         finally:
             print('End handle messages.')
 
+    def pump_messages(self, mp_queue, aio_queue, loop):
+        """Feed batches from a blocking queue into an asyncio queue."""
+        while True:
+            messages = self.drain_messages(mp_queue)
+            try:
+                loop.call_soon_threadsafe(aio_queue.put_nowait, messages)
+            except RuntimeError:
+                # Event loop has closed.
+                break
+            if self.is_stopped():
+                break
+
     def send_message_to_streams(self, message):
         for stream in self.active_streams.values():
             if stream.is_alive():
                 stream.recv_message_queue.put(message)
 
+    def drain_messages(self, q):
+        """Block for one message, then drain any backlog in one pass."""
+        messages = [q.get()]
+        while not q.empty():
+            messages.append(q.get())
+        return messages
+
     async def recv_from_streams(self):
         """Coroutine to handle messages from sub-processes."""
         try:
             while not self.is_stopped() or (
-                    not self.recv_message_queue.empty()):
-                # Block here until message received.
-                message = await asyncio.to_thread(self.recv_message_queue.get)
-                if self.debug and message:
-                    print(f'{__class__} sub-process message: {message}')
+                    not self.stream_message_queue.empty()):
+                # Block here until the pump thread posts a batch.
+                messages = await self.stream_message_queue.get()
+                for message in messages:
+                    if self.debug and message:
+                        print(f'{__class__} sub-process message: {message}')
         finally:
             if self.debug:
                 print('End stream messaging.')
@@ -170,12 +230,23 @@ class Relay:
         return self.stop_event.is_set()
 
     def remove_lost_streams(self):
-        for stream_key in list(self.active_streams):
-            stream = self.active_streams[stream_key]
+        # Rebuild the dict in one pass over the stop events rather than
+        # snapshotting the keys and deleting entries one by one.
+        removed = 0
+        active = {}
+        for stream_key, stream in self.active_streams.items():
             if stream.is_stopped():
                 print(f'Removing: {stream.name}')
-                del self.active_streams[stream_key]
+                removed += 1
+            else:
+                active[stream_key] = stream
+        self.active_streams = active
+        # Forget UIDs for removed streams so a recovered stream can be
+        # picked up again.
+        self.uid_to_key = {uid: key for uid, key in self.uid_to_key.items()
+                           if key in self.active_streams}
         #print(f'Total active streams: {len(self.active_streams)}')
+        return removed
 
     def make_stream_key(self, stream):
         key = ':'.join([
@@ -239,28 +310,25 @@ def main():
         help='Print extra debugging information.')
     args = parser.parse_args()
 
-    # Add additional predicates.
-    pred = args.pred
-
-    if len(pred) > 0:
-        pred = ("not(starts-with(name, '_relay_')) and " +
-                "not(starts-with(name, '_monitor_')) and " +
-                "not(type='control') and " +
-                "not(type='Markers') and " + pred)
-    else:
-        pred = ("not(starts-with(name, '_relay_')) and " +
-                "not(starts-with(name, '_monitor_')) and " +
-                "not(type='control') and " +
-                "not(type='Markers')")
+    # Use uvloop for the message-handling event loop if available.
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    # Build the matching predicate from a list of clauses.
+    clauses = ["not(starts-with(name, '_relay_'))",
+               "not(starts-with(name, '_monitor_'))",
+               "not(type='control')",
+               "not(type='Markers')"]
+    if args.pred:
+        clauses.append(f'({args.pred})')
     if not args.non_local:
-        pred = f"hostname='{platform.node()}' and " + pred
+        clauses.insert(0, f"hostname='{platform.node()}'")
+    pred = ' and '.join(clauses)
     print(f'Stream matching predicate: {repr(pred)}')
 
-    if args.re_encode_timestamps and (
-            not args.chunk_size == 1):
-        print('Setting chunk size to 1 for timestamp re-encoding.')
-        args.chunk_size = 1
-
     relay = Relay(pred, control_name=args.control_name, debug=args.debug)
 
     try:
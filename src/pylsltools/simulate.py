@@ -2,7 +2,11 @@
 
 import argparse
 import asyncio
+import functools
+import logging
 import multiprocessing as mp
+import multiprocessing.connection
+import sys
 import threading
 
 from pylsl import local_clock
@@ -10,6 +14,14 @@ from pylsl import local_clock
 from pylsltools import ControlStates
 from pylsltools.streams import ControlReceiver, TestStream
 
+logger = logging.getLogger(__name__)
+
+# Channel data functions and formats accepted on the command line.
+channel_functions = ('stream-id', 'stream-seq', 'counter', 'counter+',
+                     'counter-mod-fs', 'impulse', 'sine', 'sine+')
+channel_formats = ('float32', 'double64', 'string', 'int64', 'int32',
+                   'int16', 'int8')
+
 
 class Simulate:
     """Generate test synthetic data streams."""
@@ -20,7 +32,7 @@ class Simulate:
     def __init__(self, num_streams, functions, name, content_type,
                  channel_count, nominal_srate, channel_format, source_id,
                  channel_labels=None, channel_types=None, channel_units=None,
-                 control_name=None, debug=False):
+                 control_name=None, pin_cpus=False, debug=False):
         """Initialise simulation test.
 
         Optionally can receive messages from an input LSL control
@@ -43,12 +55,18 @@ class Simulate:
         self.channel_units = channel_units
         # Create barrier for sub-process synchronisation.
         self.barrier = mp.Barrier(self.num_streams)
+        # One event shared by all stream processes, so stopping the
+        # simulation is a single futex wake rather than one event per
+        # stream. Only ever set from the parent; each stream keeps its
+        # own stop event for self-termination.
+        self.stream_stop_event = mp.Event()
         # For receiving messages from sub-processes.
         self.recv_message_queue = mp.SimpleQueue()
         # For receiving messages from a controller stream.
         if control_name:
             self.controller = ControlReceiver(control_name,
                                               debug=debug)
+        self.pin_cpus = pin_cpus
         self.debug = debug
 
     def start(self, sync, latency, max_time, max_samples, chunk_size,
@@ -58,30 +76,46 @@ class Simulate:
         if self.controller:
             self.controller.start()
 
-        # Create sub-processes.
-        streams = [TestStream(stream_idx, self.functions, self.name,
-                              self.content_type, self.channel_count,
-                              self.nominal_srate, self.channel_format,
-                              source_id=self.source_id,
-                              channel_labels=self.channel_labels,
-                              channel_types=self.channel_types,
-                              channel_units=self.channel_units,
-                              latency=latency,
-                              max_time=max_time,
-                              max_samples=max_samples,
-                              chunk_size=chunk_size,
-                              max_buffered=max_buffered,
+        # Create sub-processes. Build the shared constructor arguments
+        # once; only the stream index and its private receive queue
+        # vary per stream.
+        base_kwargs = dict(functions=self.functions,
+                           name=self.name,
+                           content_type=self.content_type,
+                           channel_count=self.channel_count,
+                           nominal_srate=self.nominal_srate,
+                           channel_format=self.channel_format,
+                           source_id=self.source_id,
+                           channel_labels=self.channel_labels,
+                           channel_types=self.channel_types,
+                           channel_units=self.channel_units,
+                           latency=latency,
+                           max_time=max_time,
+                           max_samples=max_samples,
+                           chunk_size=chunk_size,
+                           max_buffered=max_buffered,
+                           # Each sub-process shares the same queue
+                           # for sending message to the main process.
+                           send_message_queue=self.recv_message_queue,
+                           barrier=self.barrier,
+                           group_stop_event=self.stream_stop_event,
+                           pin_cpus=self.pin_cpus,
+                           debug=self.debug)
+        streams = [TestStream(stream_idx,
                               # Each sub-process has a unique
                               # recv_message queue.
                               recv_message_queue=mp.SimpleQueue(),
-                              # Each sub-process shares the same queue
-                              # for sending message to the main process.
-                              send_message_queue=self.recv_message_queue,
-                              barrier=self.barrier,
-                              debug=self.debug)
+                              **base_kwargs)
                    for stream_idx in range(self.num_streams)]
 
         self.streams = streams
+        # Streams not yet observed stopped; see streams_stopped.
+        self.pending_streams = list(streams)
+        # Live children, pruned by sentinel readers once the event
+        # loop is running; see handle_messages. Always rebound, never
+        # mutated, so other threads can snapshot it safely.
+        self.alive_streams = frozenset(streams)
+        self.watch_sentinels = False
 
         for stream in self.streams:
             # Start sub-processes.
@@ -102,40 +136,105 @@ class Simulate:
             # Block here until runner returns.
             runner.run(self.handle_messages())
 
-        for stream in self.streams:
-            # Block until all child processes return.
-            stream.join()
+        # Block until all child processes return.
+        self.join_streams()
 
         if self.controller:
             # Block until controller returns.
             self.controller.join()
 
     async def handle_messages(self):
+        # Bridge the blocking sub-process queue onto the event loop
+        # with one long-lived reader thread, rather than paying an
+        # executor dispatch per batch.
+        loop = asyncio.get_running_loop()
+        self.stream_message_queue = asyncio.Queue()
+        pump_thread = threading.Thread(
+            target=self.pump_messages,
+            args=[self.recv_message_queue, self.stream_message_queue, loop],
+            daemon=True)
+        pump_thread.start()
+        # A child's sentinel becomes readable when it exits, so the
+        # loop can track liveness without a waitpid probe per stream
+        # per broadcast.
+        try:
+            for stream in self.streams:
+                loop.add_reader(stream.sentinel, self.stream_exited, stream)
+            self.watch_sentinels = True
+        except NotImplementedError:
+            # Proactor loop (Windows) cannot watch pipe handles;
+            # broadcasts fall back to per-stream is_alive checks.
+            pass
         try:
             async with asyncio.TaskGroup() as tg:
                 tg.create_task(self.recv_from_streams())
                 if self.controller:
                     tg.create_task(self.recv_from_controller())
         finally:
-            print('End handle messages.')
+            logger.debug('End handle messages.')
+
+    def pump_messages(self, mp_queue, aio_queue, loop):
+        """Feed batches from a blocking queue into an asyncio queue."""
+        while True:
+            messages = self.drain_messages(mp_queue)
+            try:
+                loop.call_soon_threadsafe(aio_queue.put_nowait, messages)
+            except RuntimeError:
+                # Event loop has closed.
+                break
+            if self.is_stopped():
+                break
+
+    def join_streams(self):
+        """Wait for all child processes in one multiplexed call.
+
+        Waiting on the sentinels lets children be reaped in the order
+        they actually finish, rather than blocking on each join in
+        list order.
+        """
+        sentinels = {stream.sentinel: stream for stream in self.streams}
+        while sentinels:
+            ready = mp.connection.wait(list(sentinels))
+            for sentinel in ready:
+                sentinels.pop(sentinel).join()
+
+    def stream_exited(self, stream):
+        """Event-loop callback run when a child's sentinel fires."""
+        asyncio.get_running_loop().remove_reader(stream.sentinel)
+        # Rebind rather than discard in place: broadcasts iterate this
+        # set from a worker thread.
+        self.alive_streams = self.alive_streams - {stream}
 
     def send_message_to_streams(self, message):
-        for stream in self.streams:
-            if stream.is_alive():
-                stream.recv_message_queue.put(message)
+        if self.watch_sentinels:
+            # Grab the current binding; stream_exited replaces the
+            # frozenset wholesale, so iterating it cannot race.
+            streams = self.alive_streams
+        else:
+            streams = [stream for stream in self.streams
+                       if stream.is_alive()]
+        for stream in streams:
+            stream.recv_message_queue.put(message)
+
+    def drain_messages(self, q):
+        """Block for one message, then drain any backlog in one pass."""
+        messages = [q.get()]
+        while not q.empty():
+            messages.append(q.get())
+        return messages
 
     async def recv_from_streams(self):
         """Coroutine to handle messages from sub-processes."""
         try:
-            while not self.streams_stopped(self.streams) or (
-                    not self.recv_message_queue.empty()):
-                # Block here until message received.
-                message = await asyncio.to_thread(self.recv_message_queue.get)
-                if self.debug and message:
-                    print(f'{__class__} sub-process message: {message}')
+            while not self.streams_stopped() or (
+                    not self.stream_message_queue.empty()):
+                # Block here until the pump thread posts a batch.
+                messages = await self.stream_message_queue.get()
+                for message in messages:
+                    if message:
+                        logger.debug('sub-process message: %s', message)
         finally:
-            if self.debug:
-                print('End stream messaging.')
+            logger.debug('End stream messaging.')
             self.stop()
 
     async def recv_from_controller(self):
@@ -144,32 +243,40 @@ class Simulate:
             while not self.controller.is_stopped() or (
                     not self.controller.send_message_queue.empty()):
                 # Loop here waiting for messages.
-                # Blocking.
-                message = await asyncio.to_thread(self.controller.get_message)
-                if self.debug and message:
-                    print(f'{self.__class__} controller message: {message}')
+                # Block on the message queue in a worker thread with no
+                # timeout: ControlReceiver.stop unblocks the queue with
+                # a sentinel, so there is no need to wake up and poll.
+                message = await asyncio.to_thread(
+                    self.controller.get_message, None)
                 if message:
-                    self.send_message_to_streams(message)
+                    logger.debug('controller message: %s', message)
+                    # The fan-out does one pipe write per stream, so
+                    # keep it off the event loop.
+                    await asyncio.to_thread(self.send_message_to_streams,
+                                            message)
         finally:
-            if self.debug:
-                print('End controller messaging.')
+            logger.debug('End controller messaging.')
             self.stop()
 
-    def streams_stopped(self, streams):
-        for stream in streams:
-            if not stream.is_stopped():
-                return False
-        return True
+    def streams_stopped(self):
+        """Return True once every stream has stopped.
+
+        Streams are dropped from the pending list the first time they
+        are observed stopped, so the scan cost tracks the number of
+        streams still running rather than the total.
+        """
+        self.pending_streams = [stream for stream in self.pending_streams
+                                if not stream.is_stopped()]
+        return not self.pending_streams
 
     def stop(self):
         if not self.is_stopped():
             self.stop_event.set()
-        # Stop all stream processes.
-        for stream in self.streams:
-            if not stream.is_stopped():
-                stream.stop()
-        for stream in self.streams:
-            stream.join()
+        # Stop all stream processes with the shared event.
+        self.stream_stop_event.set()
+        # Unblock the messaging pump.
+        self.recv_message_queue.put('')
+        self.join_streams()
         if self.controller and not self.controller.is_stopped():
             self.controller.stop()
             self.controller.join()
@@ -177,11 +284,9 @@ class Simulate:
     def is_stopped(self):
         return self.stop_event.is_set()
 
-def main():
-    """Generate synthetic LSL streams."""
-    import multiprocessing
-    multiprocessing.set_start_method('spawn')
-
+@functools.lru_cache(maxsize=1)
+def make_parser():
+    """Build the command-line parser once per interpreter."""
     parser = argparse.ArgumentParser(description="""Create test LSL data
     streams using synthetic data.""")
     parser.add_argument(
@@ -206,8 +311,7 @@ def main():
         '--fn',
         nargs='+',
         default=['counter'],
-        choices=['stream-id', 'stream-seq', 'counter', 'counter+',
-                 'counter-mod-fs', 'impulse', 'sine', 'sine+'],
+        choices=channel_functions,
         help="""Function(s) to use to simulate channel data. If multiple
         function names are provided they will be recycled to match the
         number of channels.""")
@@ -221,8 +325,7 @@ def main():
     parser.add_argument(
         '--channel-format',
         default='float32',
-        choices=['float32', 'double64', 'string', 'int64', 'int32', 'int16',
-                 'int8'],
+        choices=channel_formats,
         help='Channel datatype.')
     parser.add_argument(
         '--source-id',
@@ -270,17 +373,44 @@ def main():
         type=float,
         default=0.2,
         help='Scheduling latency in seconds.')
+    parser.add_argument(
+        '--pin-cpus',
+        action='store_true',
+        help="""Pin each stream process to a CPU core. Ignored on
+        platforms without processor affinity support.""")
     parser.add_argument(
         '--debug',
         action='store_true',
         help='Print extra debugging information.')
-    args = parser.parse_args()
-    simulate = Simulate(args.num_streams, args.fn, args.name,
+    return parser
+
+def main():
+    """Generate synthetic LSL streams."""
+    if sys.platform == 'linux':
+        # Fork children from a warmed-up server process so each stream
+        # starts with pylsl and the stream classes already imported,
+        # rather than re-importing everything per spawned child.
+        mp.set_forkserver_preload(['pylsltools.streams'])
+        mp.set_start_method('forkserver')
+    else:
+        # Keep spawn on Windows and macOS: forking a server that has
+        # already loaded liblsl's threads is not fork-safe on darwin.
+        mp.set_start_method('spawn')
+
+    args = make_parser().parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.WARNING)
+
+    # Freeze the function list: it is shipped to every child and
+    # tuples pickle smaller.
+    simulate = Simulate(args.num_streams, tuple(args.fn), args.name,
                         args.content_type, args.num_channels, args.sample_rate,
                         args.channel_format, args.source_id,
                         channel_types=args.channel_type,
                         channel_units=args.channel_unit,
                         control_name=args.control_name,
+                        pin_cpus=args.pin_cpus,
                         debug=args.debug)
     try:
         simulate.start(args.sync,
@@ -1,13 +1,17 @@
 """Base stream class."""
 
 import json
+import logging
 import multiprocessing
 import threading
+from itertools import repeat
 from multiprocessing import Process
 from threading import Thread
 
 from pylsl import IRREGULAR_RATE, StreamInfo
 
+logger = logging.getLogger(__name__)
+
 
 class BaseStream():
     """Base stream initialised with LSL properties."""
@@ -47,7 +51,7 @@ class BaseStreamThread(Thread, BaseStream):
 
     def stop(self):
         if not self.is_stopped():
-            print('Terminating thread...')
+            logger.debug('Terminating thread: %s', self.name)
             self.stop_event.set()
 
     def cleanup(self):
@@ -59,23 +63,34 @@ class BaseStreamProcess(Process, BaseStream):
     # Event to terminate the process.
     stop_event = None
 
+    # Optional event shared by a group of streams.
+    group_stop_event = None
+
     # Queue to receive messages from parent thread.
     recv_message_queue = None
 
     # Queue to send messages to parent thread.
     send_message_queue = None
 
-    def __init__(self, recv_message_queue, send_message_queue, **kwargs):
+    def __init__(self, recv_message_queue, send_message_queue,
+                 group_stop_event=None, **kwargs):
         super().__init__(**kwargs)
 
-        # Event to terminate the thread.
+        # Event to terminate this process. Streams set this themselves
+        # when they finish, so it must stay per-stream.
         self.stop_event = multiprocessing.Event()
+        # A parent can inject a shared event to stop a whole group of
+        # streams with one set(); streams only ever read it.
+        self.group_stop_event = group_stop_event
 
         # Set class attributes.
         self.recv_message_queue = recv_message_queue
         self.send_message_queue = send_message_queue
 
     def is_stopped(self):
+        if self.group_stop_event is not None and (
+                self.group_stop_event.is_set()):
+            return True
         return self.stop_event.is_set()
 
     def run(self):
@@ -83,7 +98,7 @@ class BaseStreamProcess(Process, BaseStream):
 
     def stop(self):
         if not self.is_stopped():
-            print('Terminating process...')
+            logger.debug('Terminating process: %s', self.name)
             self.stop_event.set()
             if self.send_message_queue:
                 # Unblock any waiting threads.
@@ -111,9 +126,6 @@ class DataStream(BaseStreamProcess, BaseStream):
         self.channel_types = channel_types
         self.channel_units = channel_units
 
-        # Event to terminate the process.
-        self.stop_event = multiprocessing.Event()
-
     def make_stream_info(self, name, content_type, channel_count,
                          nominal_srate, channel_format, *, source_id='',
                          manufacturer=None, channel_labels=None,
@@ -139,13 +151,21 @@ class DataStream(BaseStreamProcess, BaseStream):
         channel_units = self.check_channel_units(channel_units,
                                                  channel_count)
         channels = info.desc().append_child('channels')
-        for i in range(channel_count):
+        # For wide streams this loop is all pybind round-trips, so
+        # keep the Python side minimal: zip the metadata once instead
+        # of indexing and re-testing the lists per channel.
+        if not channel_types:
+            channel_types = repeat(None)
+        if not channel_units:
+            channel_units = repeat(None)
+        for label, ch_type, ch_unit in zip(channel_labels, channel_types,
+                                           channel_units):
             ch = channels.append_child('channel')
-            ch.append_child_value('label', channel_labels[i])
-            if channel_types:
-                ch.append_child_value('type', channel_types[i])
-            if channel_units:
-                ch.append_child_value('unit', channel_units[i])
+            ch.append_child_value('label', label)
+            if ch_type:
+                ch.append_child_value('type', ch_type)
+            if ch_unit:
+                ch.append_child_value('unit', ch_unit)
         return info
 
     def check_channel_labels(self, channel_labels, channel_count):
@@ -153,7 +173,8 @@ class DataStream(BaseStreamProcess, BaseStream):
             if len(channel_labels) == channel_count:
                 pass
             else:
-                print('{channel_count} channel labels required, {len(channel_labels)} provided.')
+                logger.warning('%d channel labels required, %d provided.',
+                               channel_count, len(channel_labels))
                 channel_labels = self.make_channel_labels(channel_count)
         else:
             channel_labels = self.make_channel_labels(channel_count)
@@ -164,10 +185,13 @@ class DataStream(BaseStreamProcess, BaseStream):
             if len(channel_types) == channel_count:
                 pass
             else:
-                print('{channel_count} channel types required, {len(channel_types)} provided.')
+                logger.warning('%d channel types required, %d provided.',
+                               channel_count, len(channel_types))
                 channel_types = 'misc'
         if isinstance(channel_types, str):
-            channel_types = [channel_types] * channel_count
+            # One shared reference per channel; no need to materialise
+            # a list just to iterate it once.
+            channel_types = repeat(channel_types, channel_count)
         return channel_types
 
     def check_channel_units(self, channel_units, channel_count):
@@ -175,15 +199,24 @@ class DataStream(BaseStreamProcess, BaseStream):
             if len(channel_units) == channel_count:
                 pass
             else:
-                print('{channel_count} channel units required, {len(channel_units)} provided.')
+                logger.warning('%d channel units required, %d provided.',
+                               channel_count, len(channel_units))
                 channel_units = None
         if isinstance(channel_units, str):
-            channel_units = [channel_units] * channel_count
+            channel_units = repeat(channel_units, channel_count)
         return channel_units
 
+    # Generated default labels keyed by channel count, shared across
+    # instances so streams with the same width reuse one list.
+    channel_label_cache = {}
+
     def make_channel_labels(self, channel_count):
-        return [f'ch:{channel_idx:0=2d}' for channel_idx in
-                range(channel_count)]
+        labels = self.channel_label_cache.get(channel_count)
+        if labels is None:
+            labels = [f'ch:{channel_idx:0=2d}' for channel_idx in
+                      range(channel_count)]
+            self.channel_label_cache[channel_count] = labels
+        return labels
 
 
 class BaseMarkerStream(BaseStream):
@@ -40,6 +40,9 @@ class ControlReceiver(MarkerStreamThread):
 
         self.inlet = StreamInlet(sender_info, max_buflen=1, max_chunklen=1,
                                  recover=False, processing_flags=proc_ALL)
+        # Bind the hot-loop enum member to a local to avoid repeated
+        # attribute lookups per message.
+        stop_state = self.control_states.STOP
         try:
             while not self.is_stopped():
                 # Blocking.
@@ -55,7 +58,7 @@ class ControlReceiver(MarkerStreamThread):
                         self.time_stamp = time_stamp
                         self.send_message_queue.put(message)
                         # When STOP stop this thread.
-                        if message['state'] == self.control_states.STOP:
+                        if message['state'] == stop_state:
                             self.stop()
         except LostError as exc:
             print(f'{self.name}: {exc}')
@@ -64,6 +67,12 @@ class ControlReceiver(MarkerStreamThread):
             self.cleanup()
             print(f'Ended: {self.name}.')
 
+    def stop(self):
+        if not self.is_stopped():
+            super().stop()
+            # Unblock any consumer waiting on the message queue.
+            self.send_message_queue.put('')
+
     def cleanup(self):
         if self.inlet:
             self.inlet.close_stream()
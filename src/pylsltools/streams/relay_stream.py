@@ -52,10 +52,6 @@ class RelayStream(DataStream):
 
     def run(self):
         """Relay process main loop."""
-        # FIXME: Integrate chunking option.
-        # Chunk size should be 1 when re-encoding timestamps to ensure
-        # we get samples as fast as possible.
-
         # We need to resolve the StreamInfo again because they don't
         # appear to be thread-safe.
         sender_info = None
@@ -104,30 +100,36 @@ class RelayStream(DataStream):
             # TODO: Integrate control states!
             # Could use this to pre-process/reduce data being relayed.
             while not self.is_stopped():
-                sample, timestamp = self.inlet.pull_sample(0.2)
+                # Pull whatever has arrived as one chunk: one FFI call
+                # for the batch instead of one per sample.
+                chunk, timestamps = self.inlet.pull_chunk(0.2)
                 now = local_clock()
-                #chunk, timestamps = self.inlet.pull_chunk(timeout)
-                if sample:
+                if timestamps:
+                    n_samples = len(timestamps)
                     if self.re_encode_timestamps:
-                        # Re-encode timestamp.
-                        timestamp = now
+                        # Re-encode against the local clock in one
+                        # pass, preserving the inter-sample spacing
+                        # within the chunk.
+                        offset = now - timestamps[-1]
+                        timestamps = [t + offset for t in timestamps]
                     if self.output:
-                        outlet.push_sample(sample, timestamp)
+                        outlet.push_chunk(chunk, timestamps)
                     if self.debug and (
                             self.nominal_srate <= 5
-                            or (sample_count % self.nominal_srate) == 0):
-                        self.print(self.name, now, timestamp,
-                                   self.content_type, sample)
+                            or (sample_count %
+                                self.nominal_srate) < n_samples):
+                        self.print(self.name, now, timestamps[-1],
+                                   self.content_type, chunk[-1])
                     if (self.monitor
                         and (self.nominal_srate == 0
                              or (sample_count %
                                  (self.nominal_srate *
-                                  self.monitor_interval)) == 0)):
+                                  self.monitor_interval)) < n_samples)):
                         self.monitor.send_JSON(
                             hostname=self.sender_hostname,
                             name=self.sender_name,
                             sample_count=sample_count)
-                    sample_count = sample_count + 1
+                    sample_count = sample_count + n_samples
         except LostError as exc:
             print(f'{self.name}: {exc}')
         except KeyboardInterrupt:
@@ -29,7 +29,7 @@ class TestStream (DataStream):
                  channel_units=None, latency=None, max_time=None,
                  max_samples=None, chunk_size=None, max_buffered=None,
                  recv_message_queue=None, send_message_queue=None,
-                 barrier=None, debug=False, **kwargs):
+                 barrier=None, pin_cpus=False, debug=False, **kwargs):
         if name:
             name = f'{name} test stream {stream_idx} {" ".join(g for g in functions)}'
         else:
@@ -70,9 +70,17 @@ class TestStream (DataStream):
         self.chunk_size = chunk_size
         self.max_buffered = max_buffered
         self.barrier = barrier
+        self.pin_cpus = pin_cpus
         self.debug = debug
 
     def run(self):
+        if self.pin_cpus:
+            # Keep each generator on its own core for cache locality.
+            # Silently skip on platforms without sched_setaffinity.
+            try:
+                os.sched_setaffinity(0, {self.stream_idx % os.cpu_count()})
+            except (AttributeError, OSError):
+                pass
         delta = 1 / self.nominal_srate
         info = self.make_stream_info(self.name, self.content_type,
                                      self.channel_count, self.nominal_srate,